@@ -1,13 +1,19 @@
 import pickle
+import re
+import sys
 from collections import UserDict
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 
 file_path = Path('database.bin')
 
+_PHONE_OK = re.compile(r"\d{10}\Z").match  # Скомпільована один раз перевірка формату номера.
+
 
 class Field:
+    __slots__ = ()  # Поля не мають __dict__ — атрибути оголошують підкласи.
+
     def __init__(self, value):
         self.value = value  # Ініціалізація значення поля.
 
@@ -16,10 +22,14 @@ class Field:
 
 
 class Name(Field):
-    pass  # Пустий клас, який успадковується від Field.
+    # Імена тепер зберігаються як прості рядки; клас залишено (без __slots__,
+    # щоб відновлювався старий __dict__) лише для читання старих баз.
+    pass
 
 
 class Phone(Field):
+    __slots__ = ("_Phone__value",)  # Слот для приватного поля з урахуванням name mangling.
+
     def __init__(self, value):
         self.__value = None  # Приватне поле для зберігання номера телефону.
         self.value = value  # Встановлення значення через setter.
@@ -30,58 +40,130 @@ class Phone(Field):
 
     @value.setter
     def value(self, value):
-        if len(value) == 10 and value.isdigit():  # Перевірка на правильний формат номера телефону.
+        if _PHONE_OK(value):  # Перевірка на правильний формат номера телефону (рівно 10 цифр).
             self.__value = value
         else:
             raise ValueError("Invalid phone format")  # Виняток, якщо формат неправильний.
 
+    def __setstate__(self, state):
+        # Старі бази зберігали стан у __dict__; нові — у кортежі (dict, слоти).
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **(state[1] or {})}
+        self.__value = state["_Phone__value"]
+
 
 class Birthday(Field):
+    __slots__ = ("value",)
+
     def __init__(self, value):
-        date_format = "%d.%m.%Y"  # Формат дати.
+        # Ручний розбір фіксованого формату DD.MM.YYYY — без інтерпретатора форматів strptime.
         try:
-            self.date = datetime.strptime(value, date_format).date()  # Парсинг дати.
-            super().__init__(value)  # Виклик конструктора батьківського класу.
-        except ValueError:
+            if len(value) != 10 or value[2] != "." or value[5] != ".":
+                raise ValueError
+            self.value = date(int(value[6:10]), int(value[3:5]), int(value[0:2]))  # date перевірить діапазони.
+        except (TypeError, ValueError):
             raise ValueError("Invalid date format. Use DD.MM.YYYY")  # Виняток при неправильному форматі дати.
 
+    def __str__(self):
+        return self.value.strftime("%d.%m.%Y")  # Форматування дати назад у рядок.
+
+    def __setstate__(self, state):
+        # Старі бази зберігали стан у __dict__; нові — у кортежі (dict, слоти).
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **(state[1] or {})}
+        self.value = state.get("date", state["value"])  # Стара база тримала розібрану дату окремо в .date.
+
 
 class Record:
+    __slots__ = ("name", "phones", "birthday", "_repr_cache")
+
     def __init__(self, name):
-        self.name = Name(name)  # Ім'я контакту.
-        self.phones = []  # Список номерів телефону.
+        self.name = sys.intern(str(name))  # Ім'я контакту — інтернований рядок без класу-обгортки.
+        self.phones = {}  # Номери телефону: рядок номера -> Phone.
         self.birthday = None  # День народження.
+        self._repr_cache = None  # Кешований рядок для __str__, скидається при зміні запису.
 
     def add_phone(self, phone_number):
-        self.phones.append(Phone(phone_number))  # Додавання номера телефону.
+        self.phones[phone_number] = Phone(phone_number)  # Додавання номера телефону.
+        self._repr_cache = None
 
     def remove_phone(self, phone_number):
-        self.phones = [p for p in self.phones if str(p) != phone_number]  # Видалення номера телефону.
+        self.phones.pop(phone_number, None)  # Видалення номера телефону.
+        self._repr_cache = None
 
     def edit_phone(self, old_number, new_number):
-        for phone in self.phones:
-            if str(phone) == old_number:
-                phone.value = new_number  # Зміна номера телефону.
-                return
-        raise ValueError("Phone number not found")  # Виняток, якщо номер не знайдено.
+        if old_number not in self.phones:
+            raise ValueError("Phone number not found")  # Виняток, якщо номер не знайдено.
+        new_phone = Phone(new_number)  # Спочатку валідація нового номера.
+        del self.phones[old_number]
+        self.phones[new_number] = new_phone  # Зміна номера телефону.
+        self._repr_cache = None
+
+    def find_phone(self, phone_number):
+        return self.phones.get(phone_number)  # Пошук номера телефону.
 
     def add_birthday(self, birthday):
         self.birthday = Birthday(birthday)  # Додавання дня народження.
+        self._repr_cache = None
 
     def __str__(self):
-        return f"Contact name: {self.name.value}, phones: {'; '.join(p.value for p in self.phones)}"  # Повернення рядка з інформацією про контакт.
+        if self._repr_cache is None:  # Будуємо рядок лише після зміни запису.
+            self._repr_cache = f"Contact name: {self.name}, phones: {'; '.join(self.phones)}"
+        return self._repr_cache
+
+    def __setstate__(self, state):
+        # Старі бази зберігали стан у __dict__; нові — у кортежі (dict, слоти).
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **(state[1] or {})}
+        name = state["name"]
+        if isinstance(name, Field):  # Стара база тримала ім'я в обгортці Name.
+            name = name.value
+        self.name = sys.intern(str(name))
+        phones = state["phones"]
+        if isinstance(phones, list):  # Стара база тримала телефони списком.
+            phones = {phone.value: phone for phone in phones}
+        self.phones = phones
+        self.birthday = state.get("birthday")
+        self._repr_cache = None  # Кеш рядка між сесіями не переносимо.
 
 
 class AddressBook(UserDict):
+    def __init__(self, *args, **kwargs):
+        self._by_md = {}  # Індекс записів за (місяць, день) народження.
+        super().__init__(*args, **kwargs)
+
     def add_record(self, record: Record):
-        self.data[record.name.value] = record  # Додавання запису в адресну книгу.
+        self.data[record.name] = record  # Додавання запису в адресну книгу.
+        if record.birthday is not None:
+            self._index_birthday(record)  # Індексуємо день народження, якщо він вже заданий.
 
     def find(self, name):
         return self.data.get(name)  # Пошук запису за ім'ям.
 
     def delete(self, name):
-        if name in self.data:
-            del self.data[name]  # Видалення запису з адресної книги.
+        record = self.data.pop(name, None)  # Видалення запису з адресної книги.
+        if record is not None and record.birthday is not None:
+            self._unindex_birthday(record)  # Прибираємо запис з індексу днів народження.
+
+    def add_birthday(self, record: Record, birthday):
+        new_birthday = Birthday(birthday)  # Спочатку валідація, щоб не зіпсувати індекс.
+        if record.birthday is not None:
+            self._unindex_birthday(record)  # Старий день народження прибираємо з індексу.
+        record.birthday = new_birthday
+        record._repr_cache = None  # Запис змінився — кеш рядка більше не дійсний.
+        self._index_birthday(record)  # Новий день народження додаємо в індекс.
+
+    def _index_birthday(self, record: Record):
+        bd = record.birthday.value
+        self._by_md.setdefault((bd.month, bd.day), []).append(record)
+
+    def _unindex_birthday(self, record: Record):
+        bd = record.birthday.value
+        records = self._by_md.get((bd.month, bd.day))
+        if records is not None and record in records:
+            records.remove(record)
+            if not records:
+                del self._by_md[(bd.month, bd.day)]
 
     @staticmethod
     def find_next_weekday(d, weekday):
@@ -99,26 +181,19 @@ class AddressBook(UserDict):
         today = datetime.today().date()  # Поточна дата.
         upcoming_birthdays = []
 
-        for user in self.data.values():
-            if user.birthday is None:
-                continue
-            birthday_this_year = user.birthday.date.replace(year=today.year)  # Дата народження в поточному році.
-
-            if birthday_this_year < today:
-                birthday_this_year = birthday_this_year.replace(
-                    year=today.year + 1)  # Дата народження в наступному році.
-
-            if 0 <= (birthday_this_year - today).days <= days:
-                if birthday_this_year.weekday() >= 5:  # субота або неділя
-                    birthday_this_year = self.find_next_weekday(
-                        birthday_this_year, 0
+        for i in range(days + 1):  # Перевіряємо лише найближчі дати замість повного перебору книги.
+            birthday_this_year = today + timedelta(days=i)
+            for user in self._by_md.get((birthday_this_year.month, birthday_this_year.day), ()):
+                congratulation_date = birthday_this_year
+                if congratulation_date.weekday() >= 5:  # субота або неділя
+                    congratulation_date = self.find_next_weekday(
+                        congratulation_date, 0
                     )  # Понеділок
 
-                congratulation_date_str = birthday_this_year.strftime("%Y.%m.%d")
                 upcoming_birthdays.append(
                     {
-                        "name": user.name.value,
-                        "congratulation_date": congratulation_date_str,
+                        "name": user.name,
+                        "congratulation_date": congratulation_date.strftime("%Y.%m.%d"),
                     }
                 )
 
@@ -126,22 +201,27 @@ class AddressBook(UserDict):
 
 
 def input_error(func):
+    _errors = (KeyError, ValueError, IndexError)  # Кортеж винятків зв'язується один раз при декоруванні.
+
     def inner(*args, **kwargs):
         try:
             return func(*args, **kwargs)
-        except KeyError:
-            return "Name not found. Please, check and try again."  # Повідомлення при відсутності запису з таким ім'ям.
-        except ValueError as e:
-            return e  # Повідомлення про помилку введення.
-        except IndexError:
-            return "Enter correct information."  # Повідомлення про неправильну інформацію.
-
+        except _errors as e:
+            if isinstance(e, KeyError):
+                return "Name not found. Please, check and try again."  # Повідомлення при відсутності запису з таким ім'ям.
+            if isinstance(e, IndexError):
+                return "Enter correct information."  # Повідомлення про неправильну інформацію.
+            return str(e)  # Повідомлення про помилку введення.
+
+    inner.__wrapped__ = func
     return inner
 
 
 @input_error
 def add_contact(args, book: AddressBook):
-    name, phone, *_ = args  # Витягуємо ім'я та номер телефону з аргументів функції.
+    if len(args) < 2:  # Явна перевірка замість винятку при розпакуванні.
+        return "Usage: add <name> <phone>"
+    name, phone = args[0], args[1]  # Витягуємо ім'я та номер телефону з аргументів функції.
     record = book.find(name)  # Пошук запису з вказаним ім'ям в адресній книзі.
     message = "Contact updated."  # Повідомлення за замовчуванням для випадку, коли контакт буде оновлено.
 
@@ -158,7 +238,9 @@ def add_contact(args, book: AddressBook):
 
 @input_error
 def change_contact(args, book):
-    name, old_phone, new_phone, *_ = args  # Витягуємо ім'я, старий та новий номер телефону з аргументів функції.
+    if len(args) < 3:  # Явна перевірка замість винятку при розпакуванні.
+        return "Usage: change <name> <old phone> <new phone>"
+    name, old_phone, new_phone = args[0], args[1], args[2]  # Витягуємо ім'я, старий та новий номер телефону.
     record = book.find(name)  # Пошук запису з вказаним ім'ям в адресній книзі.
     if record:  # Якщо знайдено відповідний запис, змінюємо номер телефону.
         record.edit_phone(old_phone, new_phone)
@@ -169,10 +251,11 @@ def change_contact(args, book):
 
 @input_error
 def show_phone(args, book):
-    (name,) = args
-    record = book.find(name)
+    if len(args) != 1:  # Явна перевірка замість винятку при розпакуванні.
+        return "Usage: phone <name>"
+    record = book.find(args[0])
     if record:
-        return "; ".join([str(phone) for phone in record.phones])  # Повернення номерів телефону для вказаного контакту.
+        return "; ".join(record.phones)  # Повернення номерів телефону для вказаного контакту (ключі — самі рядки).
     else:
         raise KeyError
 
@@ -182,13 +265,16 @@ def show_all(book):
 
 
 def parse_input(user_input):
-    cmd, *args = user_input.split()  # Розбиваємо введений рядок на команду та аргументи.
-    cmd = cmd.strip().lower()  # Перетворюємо команду у нижній регістр і видаляємо зайві пробіли.
-    return cmd, *args  # Повертаємо команду та аргументи.
+    tokens = user_input.split()  # Розбиваємо введений рядок на команду та аргументи.
+    if not tokens:  # Порожній рядок — немає команди.
+        return "", ()
+    return tokens[0].lower(), tuple(tokens[1:])  # Команда у нижньому регістрі та аргументи кортежем.
 
 
 @input_error
 def add_birthday(args, book):
+    if len(args) < 2:  # Явна перевірка замість винятку при зверненні за індексом.
+        return "Usage: add-birthday <name> <DD.MM.YYYY>"
     # Витягуємо ім'я та день народження з аргументів функції.
     name = args[0]
     birthday = args[1]
@@ -196,7 +282,7 @@ def add_birthday(args, book):
     record = book.find(name)
     # Якщо знайдено відповідний запис, додаємо день народження.
     if record:
-        record.add_birthday(birthday)
+        book.add_birthday(record, birthday)  # Через книгу, щоб оновився індекс днів народження.
         return "Birthday added."
     else:
         raise KeyError  # Виняток, якщо запис з вказаним ім'ям не знайдено.
@@ -204,17 +290,46 @@ def add_birthday(args, book):
 
 @input_error
 def show_birthday(args, book):
-    (name,) = args  # Витягуємо ім'я з аргументів функції.
+    if len(args) != 1:  # Явна перевірка замість винятку при розпакуванні.
+        return "Usage: show-birthday <name>"
     # Пошук запису з вказаним ім'ям в адресній книзі.
-    record = book.find(name)
+    record = book.find(args[0])
+    if record is None:
+        raise KeyError  # Виняток, якщо запис з вказаним ім'ям не знайдено.
     # Повернення рядка з датою народження для вказаного контакту.
     return str(record.birthday)
 
 
+def birthdays(args, book):
+    upcoming = book.get_upcoming_birthdays()  # Список наближених днів народження.
+    if not upcoming:
+        return "There are no upcoming birthdays."
+    return "\n".join(f"{day}" for day in upcoming)
+
+
+# Таблиця команд: одна вибірка зі словника замість ланцюжка порівнянь.
+COMMANDS = {
+    "add": add_contact,
+    "change": change_contact,
+    "phone": show_phone,
+    "all": lambda args, book: show_all(book),
+    "add-birthday": add_birthday,
+    "show-birthday": show_birthday,
+    "birthdays": birthdays,
+}
+EXITS = frozenset(("close", "exit"))
+
+
 def load_data():
     if file_path.is_file():
         with open(file_path, 'rb') as file:
-            return pickle.load(file)
+            book = pickle.load(file)
+        if not hasattr(book, '_by_md'):  # База, збережена версією без індексу днів народження.
+            book._by_md = {}
+            for record in book.data.values():
+                if record.birthday is not None:  # Записи вже приведені до нової розкладки в __setstate__.
+                    book._index_birthday(record)
+        return book
     else:
         return AddressBook()
 
@@ -224,49 +339,59 @@ def save_data(data_book):
         pickle.dump(data_book, file)
 
 
-def main():
-    book = load_data()
+def execute_command(command, args, book):
+    """Виконує одну команду. Повертає відповідь або None, якщо бот має завершити роботу."""
+    if command in EXITS:
+        save_data(book)
+        return None
+
+    if command == "hello":
+        return "How can I help you?"
+
+    handler = COMMANDS.get(command)  # Пошук обробника в таблиці команд.
+    return handler(args, book) if handler else "Invalid command."
+
+
+def run_interactive(book):
     print("Welcome to the assistant bot!")
     while True:
         user_input = input("Enter a command: ")
-        command, *args = parse_input(user_input)
-
-        if command in ["close", "exit"]:
+        command, args = parse_input(user_input)
+        if not command:  # Порожній ввід пропускаємо.
+            continue
+        result = execute_command(command, args, book)
+        if result is None:
             print("Good bye!")
-            save_data(book)
             break
+        print(result)
 
-        elif command == "hello":
-            print("How can I help you?")
-
-        elif command == "add":
-            print(add_contact(args, book))
-
-        elif command == "change":
-            print(change_contact(args, book))
 
-        elif command == "phone":
-            print(show_phone(args, book))
-
-        elif command == "all":
-            print(show_all(book))
-
-        elif command == "add-birthday":
-            print(add_birthday(args, book))
-
-        elif command == "show-birthday":
-            print(show_birthday(args, book))
+def run_batch(book):
+    write = sys.stdout.write  # Прямий запис у stdout без накладних витрат print().
+    readline = sys.stdin.readline
+    write("Welcome to the assistant bot!\n")
+    while True:
+        write("Enter a command: ")
+        line = readline()
+        if not line:  # Кінець вхідного потоку.
+            break
+        command, args = parse_input(line)
+        if not command:  # Порожній рядок пропускаємо.
+            continue
+        result = execute_command(command, args, book)
+        if result is None:
+            write("Good bye!\n")
+            break
+        write(result)
+        write("\n")
 
-        elif command == "birthdays":
-            birthdays = book.get_upcoming_birthdays()
-            if not len(birthdays):
-                print("There are no upcoming birthdays.")
-                continue
-            for day in birthdays:
-                print(f"{day}")
 
-        else:
-            print("Invalid command.")
+def main():
+    book = load_data()
+    if sys.stdin.isatty():
+        run_interactive(book)  # Інтерактивний режим зберігає редагування рядка через input().
+    else:
+        run_batch(book)  # Пакетний режим для перенаправленого вводу (файли команд, імпорт).
 
 
 if __name__ == "__main__":